@@ -1,64 +1,167 @@
 #!/usr/bin/env python3
 import os
 import sys
+import itertools
+import operator
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import csv
-from io import StringIO
 import sqlite3
 import argparse
 from dotenv import load_dotenv
+from everylot.everylot import sanitize_address
 
-def fetch_cook_county_rows(year='2023', city='CHICAGO', batch_size=50000):
+_SODA_URL = "https://datacatalog.cookcountyil.gov/resource/3723-97qp.csv"
+
+# Number of SODA pages fetched concurrently (and the session pool size)
+# when the paginated fallback is used.
+_MAX_PARALLEL_PAGES = 4
+
+# LIMIT for the single-query export; comfortably above the ~1.9M parcels
+# in Cook County (SODA returns only 1,000 rows when no LIMIT is given).
+_EXPORT_LIMIT = 3000000
+
+# Rows per multi-row INSERT statement in create_local_db. Three bound
+# parameters per row keeps a full chunk well under SQLite's 999-parameter
+# statement limit.
+_INSERT_CHUNK_ROWS = 100
+
+def _make_session():
     """
-    Fetch raw rows from Cook County SODA (CSV) for the given tax year and city.
-    Uses pagination to fetch all records, with a maximum of 50,000 records per page.
+    Build a keep-alive Session for SODA fetches: one TCP+TLS handshake for
+    the whole run, gzip on the wire, and retries for transient errors and
+    rate limits.
     """
-    url = "https://datacatalog.cookcountyil.gov/resource/3723-97qp.csv"
     token = os.getenv("CHICAGO_DATA_PORTAL_TOKEN")
     if not token:
         raise ValueError("CHICAGO_DATA_PORTAL_TOKEN not found in environment")
 
-    headers = {
-        "X-App-Token": token
-    }
-    
-    all_rows = []
-    offset = 0
-    
-    while True:
-        params = {
-            "$query": f"""SELECT pin, pin10, year, prop_address_full,
-                         prop_address_city_name, prop_address_state, prop_address_zipcode_1,
-                         mail_address_name, mail_address_full, mail_address_city_name,
-                         mail_address_state, mail_address_zipcode_1
-                         WHERE (year IN ('{year}'))
-                           AND caseless_one_of(prop_address_city_name, '{city}', '{city.title()}')
-                         ORDER BY pin ASC
-                         LIMIT {batch_size}
-                         OFFSET {offset}"""
-        }
-        
-        print(f"Fetching records {offset} to {offset + batch_size}...")
-        r = requests.get(url, headers=headers, params=params)
+    session = requests.Session()
+    session.headers.update({
+        "X-App-Token": token,
+        "Accept-Encoding": "gzip"
+    })
+    session.mount("https://", HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=_MAX_PARALLEL_PAGES,
+        max_retries=Retry(total=5, backoff_factor=0.5,
+                          status_forcelist=[429, 500, 502, 503, 504])
+    ))
+    return session
+
+def _soda_query(year, city, limit, offset=None):
+    """
+    Build the SoQL query for the parcel export. Only projects the columns
+    the pipeline actually consumes (pin is kept for the stable ORDER BY).
+    """
+    query = f"""SELECT pin, pin10, prop_address_full,
+               prop_address_city_name, prop_address_state, prop_address_zipcode_1
+               WHERE (year IN ('{year}'))
+                 AND caseless_one_of(prop_address_city_name, '{city}', '{city.title()}')
+               ORDER BY pin ASC
+               LIMIT {limit}"""
+    if offset is not None:
+        query += f"\n OFFSET {offset}"
+    return query
+
+def iter_cook_county_rows(year='2023', city='CHICAGO'):
+    """
+    Stream raw rows from Cook County SODA (CSV) for the given tax year and
+    city using one unpaginated export query. Socrata re-runs the server-side
+    ORDER BY for every LIMIT/OFFSET page, so a single large query does the
+    sort once and avoids the per-page round trips.
+    """
+    session = _make_session()
+    try:
+        params = {"$query": _soda_query(year, city, _EXPORT_LIMIT)}
+
+        print("Fetching all records in a single export query...")
+        count = 0
+        with session.get(_SODA_URL, params=params, stream=True) as r:
+            r.raise_for_status()
+            reader = csv.reader(r.iter_lines(decode_unicode=True))
+            header = next(reader, None)
+            if header:
+                for row in reader:
+                    count += 1
+                    yield dict(zip(header, row))
+        print(f"Fetched {count} records")
+    finally:
+        session.close()
+
+def iter_cook_county_rows_paginated(year='2023', city='CHICAGO', batch_size=50000):
+    """
+    Stream raw rows using LIMIT/OFFSET pagination with a maximum of 50,000
+    records per page. Fallback for when the single export query times out.
+    """
+    session = _make_session()
+
+    try:
+        # Keep a small window of pages in flight so page N+1 downloads
+        # while page N is being consumed. Pages are drained in offset order
+        # to preserve the pin sort (first-occurrence dedup depends on it);
+        # speculative fetches past the last page return empty and are cheap.
+        with ThreadPoolExecutor(max_workers=_MAX_PARALLEL_PAGES) as pool:
+            pending = deque()
+            next_offset = 0
+            for _ in range(_MAX_PARALLEL_PAGES):
+                pending.append((next_offset,
+                                pool.submit(_fetch_page, session, year, city,
+                                            batch_size, next_offset)))
+                next_offset += batch_size
+
+            while pending:
+                offset, future = pending.popleft()
+                batch = future.result()
+                if not batch:  # No more records
+                    break
+
+                print(f"Fetched {len(batch)} records at offset {offset}")
+                yield from batch
+
+                if len(batch) < batch_size:  # Last page
+                    break
+
+                pending.append((next_offset,
+                                pool.submit(_fetch_page, session, year, city,
+                                            batch_size, next_offset)))
+                next_offset += batch_size
+
+            for _, future in pending:
+                future.cancel()
+    finally:
+        session.close()
+
+def _fetch_page(session, year, city, batch_size, offset):
+    """
+    Fetch and parse a single SODA page; returns a list of row dicts.
+    requests.Session is thread-safe for concurrent GETs.
+    """
+    params = {"$query": _soda_query(year, city, batch_size, offset)}
+
+    print(f"Fetching records {offset} to {offset + batch_size}...")
+    # Stream the response and feed lines straight into the CSV parser
+    # instead of materializing r.text and copying it into a StringIO.
+    with session.get(_SODA_URL, params=params, stream=True) as r:
         r.raise_for_status()
+        reader = csv.reader(r.iter_lines(decode_unicode=True))
+        header = next(reader, None)
+        if not header:
+            return []
+        return [dict(zip(header, row)) for row in reader]
 
-        # Parse CSV
-        f = StringIO(r.text)
-        reader = csv.DictReader(f)
-        batch = list(reader)
-        
-        if not batch:  # No more records
-            break
-            
-        all_rows.extend(batch)
-        offset += batch_size
-        
-        print(f"Fetched {len(batch)} records in this batch")
-        
-        if len(batch) < batch_size:  # Last page
-            break
-    
-    return all_rows
+def fetch_cook_county_rows(year='2023', city='CHICAGO', batch_size=50000, paginate=False):
+    """
+    Fetch all rows from Cook County SODA (CSV) as a list.
+    Thin wrapper around the streaming iterators for callers that need the
+    full dataset in memory; batch_size only applies to the paginated path.
+    """
+    if paginate:
+        return list(iter_cook_county_rows_paginated(year, city, batch_size))
+    return list(iter_cook_county_rows(year, city))
 
 def transform_rows_to_unique_pin10(rows):
     """
@@ -66,64 +169,147 @@ def transform_rows_to_unique_pin10(rows):
     then de-duplicates on pin10, keeping the first occurrence.
     Returns a list of unique records by pin10.
     """
-    seen_pin10 = set()
-    unique_records = []
+    # A single insertion-ordered dict keyed on pin10 does the dedup in C:
+    # setdefault keeps the first row seen for each key, so ordering and
+    # first-occurrence semantics match the old set+append loop.
+    unique = {}
     for row in rows:
-        pin10 = row['pin10']
-        if pin10 not in seen_pin10:
-            seen_pin10.add(pin10)
-            unique_records.append(row)
-    return unique_records
+        unique.setdefault(row['pin10'], row)
+    return list(unique.values())
+
+# Pulls the insert fields out of a row dict in one C-level call instead of
+# five dict.get lookups per row.
+_insert_fields = operator.itemgetter(
+    'pin10', 'prop_address_full', 'prop_address_city_name',
+    'prop_address_state', 'prop_address_zipcode_1')
+
+def _insert_rows(records):
+    """
+    Yield (pin10, address, address_clean) insert tuples, concatenating the
+    address fields into "123 Main St, Chicago, IL 60601" form. The
+    sanitized display address is precomputed here, once per lot, so the
+    bot's posting path never has to do string processing.
+    """
+    for row in records:
+        pin10, addr, city, state, zip_ = _insert_fields(row)
+        address = f"{addr.strip()}, {city.strip()}, {state.strip()} {zip_.strip()}".strip(", ")
+        yield pin10, address, sanitize_address(address)
 
 def create_local_db(records, db_path="cook_county_lots.db"):
     """
-    Creates or overwrites the local SQLite DB with a 'lots' table
-    unique by pin10. The 'id' column = pin10.
+    Creates or updates the local SQLite DB with a 'lots' table unique by
+    pin10. The 'id' column = pin10. Re-running the ingest upserts changed
+    addresses in place, so posted_twitter/posted_bluesky state survives
+    dataset refreshes instead of being wiped by a full rebuild.
     If START_PIN10 is set in environment variables, marks all pins up to
     and including that PIN as '1' in posted_bluesky column.
     """
-    conn = sqlite3.connect(db_path)
+    # Decided before connect(), which creates the file.
+    fresh_build = not os.path.exists(db_path) or os.path.getsize(db_path) == 0
+
+    # isolation_level=None disables the implicit per-statement transactions
+    # so the whole build runs inside one explicit transaction below.
+    conn = sqlite3.connect(db_path, isolation_level=None)
     c = conn.cursor()
 
-    c.execute("DROP TABLE IF EXISTS lots;")
+    if fresh_build:
+        # A brand-new database has nothing to lose: journaling and fsync
+        # during the load are pure overhead, and if the build dies the
+        # recovery story is "rerun the ingest". Durability is restored
+        # after the load.
+        c.executescript("""
+            PRAGMA journal_mode=OFF;
+            PRAGMA synchronous=OFF;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA locking_mode=EXCLUSIVE;
+            PRAGMA cache_size=-200000;
+        """)
+    else:
+        # An existing database carries the posted_twitter/posted_bluesky
+        # ledger — the one thing rerunning the ingest cannot restore — so
+        # the upsert must stay crash-safe: under WAL a mid-refresh crash
+        # just rolls back. synchronous=NORMAL costs almost nothing here
+        # because the whole refresh is a single transaction.
+        c.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-200000;
+        """)
+
+    c.execute("BEGIN IMMEDIATE")
+
     c.execute("""
-    CREATE TABLE lots (
+    CREATE TABLE IF NOT EXISTS lots (
         id TEXT PRIMARY KEY,
         address TEXT,
+        address_clean TEXT,
         lat REAL,
         lon REAL,
         posted_twitter TEXT DEFAULT '0',
         posted_bluesky TEXT DEFAULT '0'
-    )
+    ) WITHOUT ROWID
     """)
 
-    insert_sql = "INSERT INTO lots (id, address, lat, lon) VALUES (?, ?, ?, ?)"
-    for row in records:
-        pin10 = row.get('pin10', '')
-        # build address string
-        prop_address = row.get('prop_address_full', '').strip()
-        prop_city = row.get('prop_address_city_name', '').strip()
-        prop_state = row.get('prop_address_state', '').strip()
-        prop_zip = row.get('prop_address_zipcode_1', '').strip()
+    # Partial indexes keep the bot's "next unposted lot" lookup an O(log n)
+    # btree descent instead of a full table scan; the composite indexes
+    # cover the "last posted lot" descending query. The WHERE clauses match
+    # the predicates used by everylot.NEXT_LOT_QUERY exactly so SQLite will
+    # actually pick the partial index.
+    c.execute("CREATE INDEX IF NOT EXISTS idx_lots_unposted_bluesky ON lots(id) WHERE posted_bluesky = '0'")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_lots_unposted_twitter ON lots(id) WHERE posted_twitter = '0'")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_lots_posted_bluesky ON lots(posted_bluesky, id DESC)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_lots_posted_twitter ON lots(posted_twitter, id DESC)")
 
-        # final concatenated address: "123 Main St, Chicago, IL 60601"
-        final_address = f"{prop_address}, {prop_city}, {prop_state} {prop_zip}".strip(", ")
+    # Multi-row VALUES inserts, _INSERT_CHUNK_ROWS rows per statement
+    # (300 bound parameters, well under SQLite's 999 limit): the SQLite VM
+    # runs once per chunk instead of once per row. The upsert only rewrites
+    # the address columns, leaving posted state alone; on a stable dataset
+    # a re-ingest is therefore close to a no-op.
+    insert_head = "INSERT INTO lots (id, address, address_clean, lat, lon) VALUES "
+    insert_tail = """
+        ON CONFLICT(id) DO UPDATE SET
+            address = excluded.address,
+            address_clean = excluded.address_clean
+    """
+    row_group = "(?, ?, ?, 0.0, 0.0)"
+    full_sql = insert_head + ", ".join([row_group] * _INSERT_CHUNK_ROWS) + insert_tail
 
-        c.execute(insert_sql, (pin10, final_address, 0.0, 0.0))
+    rows_iter = _insert_rows(records)
+    while True:
+        chunk = list(itertools.islice(rows_iter, _INSERT_CHUNK_ROWS))
+        if not chunk:
+            break
+        if len(chunk) == _INSERT_CHUNK_ROWS:
+            sql = full_sql
+        else:
+            # Short final chunk; built once, so no statement-cache churn
+            sql = insert_head + ", ".join([row_group] * len(chunk)) + insert_tail
+        c.execute(sql, [value for row in chunk for value in row])
 
     # If START_PIN10 is set, mark all pins up to and including it as posted
     start_pin = os.getenv('START_PIN10')
     if start_pin:
         print(f"\nMarking all pins up to and including {start_pin} as posted...")
+        # PIN10s are fixed-width numeric strings, so once the parameter is
+        # zero-padded a plain lexicographic comparison is equivalent to the
+        # numeric one — and unlike CAST(id AS INTEGER) it can use the
+        # primary-key btree for a range scan.
         c.execute("""
-            UPDATE lots 
-            SET posted_bluesky = '1' 
-            WHERE CAST(id AS INTEGER) <= CAST(? AS INTEGER)
-        """, (start_pin,))
+            UPDATE lots
+            SET posted_bluesky = '1'
+            WHERE id <= ?
+        """, (start_pin.zfill(10),))
         rows_marked = c.execute("SELECT COUNT(*) FROM lots WHERE posted_bluesky = '1'").fetchone()[0]
         print(f"Marked {rows_marked:,d} pins as posted")
 
-    conn.commit()
+    c.execute("COMMIT")
+
+    # Re-enable durability settings now that the bulk load is done (a no-op
+    # on the refresh path); the bot does small incremental writes against
+    # this file afterwards.
+    c.execute("PRAGMA journal_mode=WAL")
+    c.execute("PRAGMA synchronous=NORMAL")
     conn.close()
 
 def main():
@@ -133,20 +319,35 @@ def main():
     parser.add_argument('--year', type=str, default='2023', help='Tax year to fetch')
     parser.add_argument('--city', type=str, default='CHICAGO', help='City to filter by')
     parser.add_argument('--db', type=str, default='cook_county_lots.db', help='Output database path')
+    parser.add_argument('--paginate', action='store_true',
+                        help='Fetch with LIMIT/OFFSET pages instead of one export query')
     args = parser.parse_args()
 
     try:
         print(f"Fetching Cook County data for {args.city} ({args.year})...")
-        print("This may take a while as we paginate through all records...")
-        rows = fetch_cook_county_rows(args.year, args.city)
-        print(f"\nFetched {len(rows):,d} total records")
+        print("This may take a while as we fetch all records...")
+
+        if args.paginate:
+            source = iter_cook_county_rows_paginated(args.year, args.city)
+        else:
+            source = iter_cook_county_rows(args.year, args.city)
+
+        # Fuse fetch -> dedupe -> insert into a single streaming pass: rows
+        # flow from the HTTP stream through the pin10 filter straight into
+        # create_local_db's executemany, so peak memory is just the
+        # seen-pin10 set rather than full copies of the dataset.
+        seen_pin10 = set()
 
-        print("\nTransforming to unique PIN10 records...")
-        unique_records = transform_rows_to_unique_pin10(rows)
-        print(f"Reduced to {len(unique_records):,d} unique PIN10 records")
+        def unique_rows():
+            for row in source:
+                pin10 = row['pin10']
+                if pin10 not in seen_pin10:
+                    seen_pin10.add(pin10)
+                    yield row
 
         print(f"\nCreating local database at {args.db}...")
-        create_local_db(unique_records, args.db)
+        create_local_db(unique_rows(), args.db)
+        print(f"Ingested {len(seen_pin10):,d} unique PIN10 records")
         print("Database created successfully!")
 
     except Exception as e:
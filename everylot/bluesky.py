@@ -1,24 +1,54 @@
 #!/usr/bin/env python3
 from datetime import datetime
-from atproto import Client
 import os
 import logging
 
+# atproto is only needed when a BlueskyPoster is actually constructed, so
+# defer the import the same way twitter.py defers tweepy. The module
+# attribute stays patchable by tests ('everylot.bluesky.Client').
+Client = None
+
+
+def _load_client():
+    global Client
+    if Client is None:
+        from atproto import Client as _Client
+        Client = _Client
+    return Client
+
+# Where the exported atproto session string is cached between invocations.
+SESSION_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "everylot", "bsky_session.txt")
+
 class BlueskyPoster:
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, session_cache=None):
         """Initialize the Bluesky poster with credentials from environment."""
         self.logger = logger or logging.getLogger('everylot.bluesky')
         self.identifier = os.getenv("BLUESKY_IDENTIFIER")
         self.password = os.getenv("BLUESKY_PASSWORD")
-        
+        self.session_cache = session_cache or os.getenv(
+            "BLUESKY_SESSION_CACHE", SESSION_CACHE_PATH)
+
         if not all([self.identifier, self.password]):
             raise ValueError("Missing Bluesky credentials in environment")
-        
-        self.client = Client()
+
+        self.client = _load_client()()
         self._login()
 
     def _login(self):
-        """Login to Bluesky."""
+        """
+        Login to Bluesky, resuming a cached session when one is available
+        so per-invocation runs skip the full auth round-trip.
+        """
+        session_string = self._read_cached_session()
+        if session_string:
+            try:
+                self.client.login(session_string=session_string)
+                self.logger.debug("Resumed cached Bluesky session")
+                return
+            except Exception as e:
+                self.logger.debug(f"Cached Bluesky session invalid, logging in fresh: {str(e)}")
+
         try:
             self.client.login(self.identifier, self.password)
             self.logger.debug("Successfully logged into Bluesky")
@@ -26,6 +56,39 @@ class BlueskyPoster:
             self.logger.error(f"Failed to login to Bluesky: {str(e)}")
             raise
 
+        self._write_cached_session()
+
+    def _read_cached_session(self):
+        """Return the cached session string, or None if there isn't one."""
+        try:
+            with open(self.session_cache) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def _write_cached_session(self):
+        """Persist the session string so the next run can resume it."""
+        # Export and validate before opening the cache file: opening with
+        # O_TRUNC first would wipe an existing (still valid) cached session
+        # whenever the export itself failed.
+        try:
+            session_string = self.client.export_session_string()
+        except Exception as e:
+            # A failed cache write should never block posting.
+            self.logger.debug(f"Could not export Bluesky session: {str(e)}")
+            return
+        if not isinstance(session_string, str) or not session_string:
+            self.logger.debug("No Bluesky session string to cache")
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self.session_cache), exist_ok=True)
+            fd = os.open(self.session_cache, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                f.write(session_string)
+        except Exception as e:
+            self.logger.debug(f"Could not cache Bluesky session: {str(e)}")
+
     def post(self, status_text, image_data=None, pin10=None, clean_address=None):
         """
         Post to Bluesky with optional image.
@@ -2,6 +2,9 @@
 import argparse
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO
 from dotenv import load_dotenv
 ### from . import __version__ as version
 from .everylot import EveryLot
@@ -10,6 +13,104 @@ from .twitter import TwitterPoster
 
 version = '0.3.1'
 
+# Floor between Street View fetches in batch mode, keeping the bot well
+# under Google's 10 requests/second limit.
+_STREETVIEW_MIN_INTERVAL = 0.1
+
+
+def _run_batch(el, count, logger):
+    """
+    Post up to `count` lots in one invocation. Uploads run on a small
+    thread pool while the main thread moves on to download the next lot's
+    image, so the Street View GET latency hides behind the poster uploads.
+    Post ids are applied at the end in one transaction per platform.
+    """
+    google_key = os.getenv('GOOGLE_API_KEY')
+    enable_bluesky = os.getenv('ENABLE_BLUESKY', 'true').lower() == 'true'
+    enable_twitter = os.getenv('ENABLE_TWITTER', 'false').lower() == 'true'
+
+    if not (enable_bluesky or enable_twitter):
+        logger.error('Neither Bluesky nor Twitter is enabled')
+        el.release()
+        return
+
+    lots = [el.lot] if el.lot else []
+    lots += el.fetch_batch(count - len(lots))
+    if not lots:
+        logger.error('No lot found')
+        return
+
+    # Every claimed lot either gets its post id or goes back in the pool:
+    # whatever fails below (poster login, image fetch, upload), the finally
+    # block releases the claims that never reached mark_many_as_posted.
+    unposted = {lot['id'] for lot in lots}
+    try:
+        posters = {}
+        if enable_bluesky:
+            try:
+                posters['Bluesky'] = BlueskyPoster(logger=logger)
+            except Exception as e:
+                logger.error(f"Failed to post to Bluesky: {e}")
+        if enable_twitter:
+            try:
+                posters['Twitter'] = TwitterPoster(logger=logger)
+            except Exception as e:
+                logger.error(f"Failed to post to Twitter: {e}")
+        if not posters:
+            return
+
+        pending = []
+        last_fetch = 0.0
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for lot in lots:
+                el.lot = lot
+
+                wait = _STREETVIEW_MIN_INTERVAL - (time.monotonic() - last_fetch)
+                if wait > 0:
+                    time.sleep(wait)
+                try:
+                    image_bytes = el.get_streetview_image(google_key).getvalue()
+                except Exception as e:
+                    logger.error(f"Failed to fetch Street View image for {lot['id']}: {e}")
+                    continue
+                last_fetch = time.monotonic()
+
+                post_data = el.compose()
+                logger.info(f"Post text: {post_data['status']}")
+                for platform, poster in posters.items():
+                    if platform == 'Bluesky':
+                        future = executor.submit(
+                            poster.post, post_data['status'], BytesIO(image_bytes),
+                            pin10=lot['id'],
+                            clean_address=el.sanitize_address(lot['address']))
+                    else:
+                        future = executor.submit(
+                            poster.post, post_data['status'], BytesIO(image_bytes),
+                            lat=post_data['lat'], lon=post_data['long'])
+                    pending.append((future, platform, lot['id']))
+
+            marks = {}
+            for future, platform, lot_id in pending:
+                try:
+                    post_id = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to post {lot_id} to {platform}: {e}")
+                    continue
+                marks.setdefault(platform, []).append((post_id, lot_id))
+
+        for platform, pairs in marks.items():
+            el.mark_many_as_posted(platform.lower(), pairs)
+            logger.info(f"Posted {len(pairs)} lot(s) to {platform}")
+            # The claim sentinel lives in the active platform's column, so
+            # only a post there resolves it.
+            if platform.lower() == el.platform:
+                unposted.difference_update(lot_id for _, lot_id in pairs)
+    finally:
+        if unposted:
+            el.release_many(unposted)
+            logger.info(f"Released {len(unposted)} unposted lot(s)")
+
+
 def main():
     load_dotenv()
 
@@ -18,12 +119,14 @@ def main():
                       help='path to SQLite lots database')
     parser.add_argument('--id', type=str, default=os.getenv('START_PIN10'),
                       help='start with this PIN10 ID')
-    parser.add_argument('-s', '--search-format', type=str, 
-                      default=os.getenv('SEARCH_FORMAT', '{address}, {city} {state}'),
+    parser.add_argument('-s', '--search-format', type=str,
+                      default=os.getenv('SEARCH_FORMAT', '{address}, Chicago, IL'),
                       help='Python format string for searching Google')
     parser.add_argument('-p', '--print-format', type=str,
                       default=os.getenv('PRINT_FORMAT', '{address}'),
                       help='Python format string for post text')
+    parser.add_argument('--batch', type=int, default=int(os.getenv('BATCH_SIZE', '1')),
+                      help='post up to this many lots in one run')
     parser.add_argument('--dry-run', action='store_true',
                       help='Do not actually post')
     parser.add_argument('-v', '--verbose', action='store_true',
@@ -42,16 +145,32 @@ def main():
                   search_format=args.search_format,
                   id_=args.id)
 
+    if args.batch > 1:
+        if args.dry_run:
+            # Batch mode exists to amortize real posting costs; a dry run
+            # previews a single lot. Say so instead of silently degrading.
+            logger.warning('--dry-run previews a single lot; ignoring --batch %d', args.batch)
+        else:
+            _run_batch(el, args.batch, logger)
+            return
+
     if not el.lot:
         logger.error('No lot found')
         return
 
-    logger.debug('%s address: %s', el.lot['id'], el.lot.get('address'))
+    logger.debug('%s address: %s', el.lot['id'], el.lot['address'])
     logger.debug('db location %s,%s', el.lot['lat'], el.lot['lon'])
 
-    # Get the streetview image
+    # Get the streetview image. On final failure (timeouts and transient
+    # errors are already retried by the session) release the claim and
+    # skip the lot cleanly instead of crashing with it held.
     google_key = os.getenv('GOOGLE_API_KEY')
-    image = el.get_streetview_image(google_key)
+    try:
+        image = el.get_streetview_image(google_key)
+    except Exception as e:
+        logger.error(f"Failed to fetch Street View image: {e}")
+        el.release()
+        return
 
     # Initialize posters based on environment settings
     post_ids = []
@@ -60,6 +179,7 @@ def main():
 
     if not (enable_bluesky or enable_twitter):
         logger.error('Neither Bluesky nor Twitter is enabled')
+        el.release()
         return
 
     # Compose the post data with sanitized address
@@ -67,30 +187,48 @@ def main():
     logger.info(f"Post text: {post_data['status']}")
 
     if not args.dry_run:
-        if enable_bluesky:
-            try:
-                bluesky = BlueskyPoster(logger=logger)
-                # Get clean address for ALT text
-                clean_address = el.sanitize_address(el.lot['address'])
-                post_id = bluesky.post(post_data['status'], image, pin10=el.lot['id'], clean_address=clean_address)
-                el.mark_as_posted('bluesky', post_id)
-                logger.info("Posted to Bluesky")
-            except Exception as e:
-                logger.error(f"Failed to post to Bluesky: {e}")
+        # The two uploads are independent network calls, so run them in
+        # parallel: wall time becomes max(bluesky, twitter) instead of the
+        # sum. Each poster gets its own BytesIO over the shared image bytes
+        # so both uploads can read from position 0 concurrently.
+        image_bytes = image.getvalue()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = {}
+            # Poster construction logs in (Bluesky) or builds an API client
+            # (Twitter), either of which can fail; guard each one so a broken
+            # platform is logged and the other still posts.
+            if enable_bluesky:
+                try:
+                    bluesky = BlueskyPoster(logger=logger)
+                    # Get clean address for ALT text
+                    clean_address = el.sanitize_address(el.lot['address'])
+                    futures[executor.submit(
+                        bluesky.post, post_data['status'], BytesIO(image_bytes),
+                        pin10=el.lot['id'], clean_address=clean_address)] = 'Bluesky'
+                except Exception as e:
+                    logger.error(f"Failed to post to Bluesky: {e}")
+            if enable_twitter:
+                try:
+                    twitter = TwitterPoster(logger=logger)
+                    futures[executor.submit(
+                        twitter.post, post_data['status'], BytesIO(image_bytes),
+                        lat=post_data['lat'], lon=post_data['long'])] = 'Twitter'
+                except Exception as e:
+                    logger.error(f"Failed to post to Twitter: {e}")
 
-        if enable_twitter:
-            try:
-                twitter = TwitterPoster(logger=logger)
-                post_id = twitter.post(
-                    post_data['status'], 
-                    image,
-                    lat=post_data['lat'],
-                    lon=post_data['long']
-                )
-                el.mark_as_posted('twitter', post_id)
-                logger.info("Posted to Twitter")
-            except Exception as e:
-                logger.error(f"Failed to post to Twitter: {e}")
+            # Database writes stay on this thread; one platform failing
+            # doesn't keep the other from being marked as posted.
+            for future in as_completed(futures):
+                platform = futures[future]
+                try:
+                    post_id = future.result()
+                    el.mark_as_posted(platform.lower(), post_id)
+                    logger.info(f"Posted to {platform}")
+                except Exception as e:
+                    logger.error(f"Failed to post to {platform}: {e}")
+    else:
+        # Give the claimed lot back so a real run will pick it up again
+        el.release()
 
 if __name__ == '__main__':
     main()
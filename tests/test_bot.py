@@ -39,8 +39,11 @@ def test_db_path(tmp_path):
     return db_path
 
 @pytest.fixture
-def mock_env(monkeypatch):
+def mock_env(monkeypatch, tmp_path):
     """Set up mock environment variables"""
+    # Posters are mocked here, but keep the Bluesky session cache pointed
+    # at a temp file anyway so nothing can touch the real ~/.cache.
+    monkeypatch.setenv("BLUESKY_SESSION_CACHE", str(tmp_path / "bsky_session.txt"))
     env_vars = {
         "GOOGLE_API_KEY": "test_google_key",
         "BLUESKY_IDENTIFIER": "test.bsky.social",
@@ -65,19 +68,24 @@ def mock_streetview_image():
 @pytest.fixture
 def mock_dependencies(mock_streetview_image):
     """Mock all external dependencies"""
-    patches = {
-        'everylot.bot.BlueskyPoster': Mock(),
-        'everylot.bot.TwitterPoster': Mock(),
-        'everylot.everylot.requests.get': Mock()
-    }
-    
-    # Configure mock responses
-    patches['everylot.bot.BlueskyPoster'].return_value.post.return_value = "bsky_post_uri"
-    patches['everylot.bot.TwitterPoster'].return_value.post.return_value = "12345"
-    patches['everylot.everylot.requests.get'].return_value.content = mock_streetview_image.getvalue()
-    
-    with patch.multiple('', **patches):
-        yield patches
+    with patch('everylot.bot.BlueskyPoster') as bluesky, \
+         patch('everylot.bot.TwitterPoster') as twitter, \
+         patch('requests.Session.get') as http_get:
+        # Configure mock responses
+        bluesky.return_value.post.return_value = "bsky_post_uri"
+        twitter.return_value.post.return_value = "12345"
+        # EveryLot routes HTTP through its pooled Session; the same mock
+        # serves the Street View image and the geocode verification (which
+        # resolves right on top of the test lots, so the address is used).
+        http_get.return_value.content = mock_streetview_image.getvalue()
+        http_get.return_value.json.return_value = {
+            "results": [{"geometry": {"location": {"lat": 41.8781, "lng": -87.6298}}}]
+        }
+        yield {
+            'everylot.bot.BlueskyPoster': bluesky,
+            'everylot.bot.TwitterPoster': twitter,
+            'requests.Session.get': http_get,
+        }
 
 class TestBot:
     def test_main_successful_run(self, test_db_path, mock_env, mock_dependencies, caplog):
@@ -91,9 +99,11 @@ class TestBot:
         # Verify Bluesky post
         mock_dependencies['everylot.bot.BlueskyPoster'].return_value.post.assert_called_once_with(
             "123 Main St",
-            ANY  # Street View image
+            ANY,  # Street View image
+            pin10='1407115016',
+            clean_address='123 Main St'
         )
-        
+
         # Verify Twitter post
         mock_dependencies['everylot.bot.TwitterPoster'].return_value.post.assert_called_once_with(
             "123 Main St",
@@ -114,6 +124,60 @@ class TestBot:
         assert "Posted to Bluesky" in caplog.text
         assert "Posted to Twitter" in caplog.text
 
+    def test_main_fetches_image_once(self, test_db_path, mock_env, mock_dependencies):
+        """Test the image is downloaded once even with both platforms enabled"""
+        with patch('sys.argv', ['bot.py', '--database', test_db_path]):
+            main()
+
+        streetview_calls = [
+            call for call in mock_dependencies['requests.Session.get'].call_args_list
+            if 'streetview' in call.args[0]
+        ]
+        assert len(streetview_calls) == 1
+
+    def test_main_batch_mode(self, test_db_path, mock_env, mock_dependencies):
+        """Test posting several lots in one invocation with --batch"""
+        with patch('sys.argv', ['bot.py', '--database', test_db_path, '--batch', '2']):
+            main()
+
+        assert mock_dependencies['everylot.bot.BlueskyPoster'].return_value.post.call_count == 2
+
+        conn = sqlite3.connect(test_db_path)
+        values = conn.execute(
+            "SELECT posted_bluesky FROM lots ORDER BY id LIMIT 2").fetchall()
+        conn.close()
+        assert values == [('bsky_post_uri',), ('bsky_post_uri',)]
+
+    def test_main_batch_mode_releases_failed_lots(self, test_db_path, mock_env, mock_dependencies, caplog):
+        """Test that lots a batch run fails to post go back in the pool"""
+        caplog.set_level(logging.ERROR)
+        mock_dependencies['everylot.bot.BlueskyPoster'].return_value.post.side_effect = Exception("Bluesky error")
+
+        with patch('sys.argv', ['bot.py', '--database', test_db_path, '--batch', '2']):
+            main()
+
+        assert "Failed to post" in caplog.text
+        conn = sqlite3.connect(test_db_path)
+        values = conn.execute(
+            "SELECT posted_bluesky FROM lots ORDER BY id").fetchall()
+        conn.close()
+        assert values == [('0',), ('0',)]
+
+    def test_main_batch_dry_run_warns(self, test_db_path, mock_env, mock_dependencies, caplog):
+        """Test that --batch with --dry-run warns instead of silently degrading"""
+        caplog.set_level(logging.WARNING)
+
+        with patch('sys.argv', ['bot.py', '--database', test_db_path, '--batch', '2', '--dry-run']):
+            main()
+
+        assert "ignoring --batch" in caplog.text
+        mock_dependencies['everylot.bot.BlueskyPoster'].return_value.post.assert_not_called()
+        conn = sqlite3.connect(test_db_path)
+        values = conn.execute(
+            "SELECT posted_bluesky FROM lots ORDER BY id").fetchall()
+        conn.close()
+        assert values == [('0',), ('0',)]
+
     def test_main_bluesky_only(self, test_db_path, mock_env, mock_dependencies, monkeypatch):
         """Test bot execution with only Bluesky enabled"""
         monkeypatch.setenv("ENABLE_TWITTER", "false")
@@ -145,7 +209,9 @@ class TestBot:
         # Verify correct lot was posted
         mock_dependencies['everylot.bot.BlueskyPoster'].return_value.post.assert_called_once_with(
             "125 Main St",
-            ANY
+            ANY,
+            pin10='1407115017',
+            clean_address='125 Main St'
         )
 
     def test_main_dry_run(self, test_db_path, mock_env, mock_dependencies):
@@ -185,6 +251,20 @@ class TestBot:
         mock_dependencies['everylot.bot.BlueskyPoster'].return_value.post.assert_not_called()
         mock_dependencies['everylot.bot.TwitterPoster'].return_value.post.assert_not_called()
 
+    def test_main_poster_init_error(self, test_db_path, mock_env, mock_dependencies, caplog):
+        """Test that a poster failing to construct doesn't block the other"""
+        caplog.set_level(logging.ERROR)
+
+        # Make BlueskyPoster construction (i.e. login) fail
+        mock_dependencies['everylot.bot.BlueskyPoster'].side_effect = Exception("Login failed")
+
+        with patch('sys.argv', ['bot.py', '--database', test_db_path]):
+            main()
+
+        assert "Failed to post to Bluesky" in caplog.text
+        # Twitter should still have posted
+        mock_dependencies['everylot.bot.TwitterPoster'].return_value.post.assert_called_once()
+
     def test_main_posting_error(self, test_db_path, mock_env, mock_dependencies, caplog):
         """Test handling of posting errors"""
         caplog.set_level(logging.ERROR)
@@ -1,10 +1,12 @@
+import csv
 import pytest
 import sqlite3
 import os
 from unittest.mock import patch, mock_open
-import responses
+import requests
 from io import StringIO
 import json
+import data_ingest
 from data_ingest import (
     fetch_cook_county_rows,
     transform_rows_to_unique_pin10,
@@ -17,38 +19,42 @@ SAMPLE_CSV_DATA = '''pin,pin10,year,prop_address_full,prop_address_city_name,pro
 14071150170000,1407115017,2023,125 MAIN ST,CHICAGO,IL,60601
 14071150180000,1407115017,2023,127 MAIN ST,CHICAGO,IL,60601'''
 
+def _make_response(body='', status=200):
+    """Build a fully-materialized requests.Response for the fake transport"""
+    response = requests.Response()
+    response.status_code = status
+    response._content = body.encode('utf-8') if isinstance(body, str) else body
+    response._content_consumed = True
+    response.encoding = 'utf-8'
+    response.headers['Content-Type'] = 'text/csv'
+    return response
+
+@pytest.fixture
+def fake_transport(monkeypatch):
+    """
+    Patch Session.send with a dict dispatcher of canned responses keyed by
+    URL (query string ignored) — no registry setup or URL regex matching
+    per request, and no network either way.
+    """
+    registry = {}
+
+    def send(self, request, **kwargs):
+        try:
+            return registry[request.url.split('?')[0]]
+        except KeyError:
+            raise AssertionError(f"Unexpected request: {request.url}")
+
+    monkeypatch.setattr(requests.Session, 'send', send)
+    return registry
+
+# Parsed once at module load; SAMPLE_CSV_DATA is the single source of
+# truth so the CSV body and the row dicts can't drift apart.
+_SAMPLE_ROWS = tuple(csv.DictReader(StringIO(SAMPLE_CSV_DATA)))
+
 @pytest.fixture
 def sample_rows():
-    """Sample property data rows"""
-    return [
-        {
-            'pin': '14071150160000',
-            'pin10': '1407115016',
-            'year': '2023',
-            'prop_address_full': '123 MAIN ST',
-            'prop_address_city_name': 'CHICAGO',
-            'prop_address_state': 'IL',
-            'prop_address_zipcode_1': '60601'
-        },
-        {
-            'pin': '14071150170000',
-            'pin10': '1407115017',
-            'year': '2023',
-            'prop_address_full': '125 MAIN ST',
-            'prop_address_city_name': 'CHICAGO',
-            'prop_address_state': 'IL',
-            'prop_address_zipcode_1': '60601'
-        },
-        {
-            'pin': '14071150180000',
-            'pin10': '1407115017',
-            'year': '2023',
-            'prop_address_full': '127 MAIN ST',
-            'prop_address_city_name': 'CHICAGO',
-            'prop_address_state': 'IL',
-            'prop_address_zipcode_1': '60601'
-        }
-    ]
+    """Sample property data rows (fresh copies, safe to mutate)"""
+    return [dict(row) for row in _SAMPLE_ROWS]
 
 @pytest.fixture
 def test_db_path(tmp_path):
@@ -56,21 +62,14 @@ def test_db_path(tmp_path):
     return str(tmp_path / "test_lots.db")
 
 class TestDataIngest:
-    @responses.activate
-    def test_fetch_cook_county_rows(self, monkeypatch):
+    def test_fetch_cook_county_rows(self, monkeypatch, fake_transport):
         """Test fetching rows from Cook County API"""
         # Mock environment variable
         monkeypatch.setenv("CHICAGO_DATA_PORTAL_TOKEN", "test_token")
-        
+
         # Mock the API response
-        responses.add(
-            responses.GET,
-            "https://datacatalog.cookcountyil.gov/resource/3723-97qp.csv",
-            body=SAMPLE_CSV_DATA,
-            status=200,
-            content_type="text/csv"
-        )
-        
+        fake_transport[data_ingest._SODA_URL] = _make_response(SAMPLE_CSV_DATA)
+
         rows = fetch_cook_county_rows(year="2023", city="CHICAGO")
         
         assert len(rows) == 3
@@ -78,6 +77,16 @@ class TestDataIngest:
         assert rows[0]['pin10'] == '1407115016'
         assert rows[0]['prop_address_full'] == '123 MAIN ST'
 
+    def test_iter_cook_county_rows_is_lazy(self, monkeypatch, fake_transport):
+        """Test the streaming fetcher yields rows without materializing a list"""
+        monkeypatch.setenv("CHICAGO_DATA_PORTAL_TOKEN", "test_token")
+        fake_transport[data_ingest._SODA_URL] = _make_response(SAMPLE_CSV_DATA)
+
+        rows = data_ingest.iter_cook_county_rows(year="2023", city="CHICAGO")
+
+        assert iter(rows) is rows  # a lazy iterator, not a list
+        assert next(rows)['pin10'] == '1407115016'
+
     def test_transform_rows_to_unique_pin10(self, sample_rows):
         """Test deduplication by PIN10"""
         unique_records = transform_rows_to_unique_pin10(sample_rows)
@@ -90,6 +99,12 @@ class TestDataIngest:
         assert len(pin10_records) == 1
         assert pin10_records[0]['prop_address_full'] == '125 MAIN ST'
 
+    def test_transform_preserves_input_order(self, sample_rows):
+        """Test that deduplication keeps rows in first-seen order"""
+        unique_records = transform_rows_to_unique_pin10(sample_rows)
+
+        assert [r['pin10'] for r in unique_records] == ['1407115016', '1407115017']
+
     def test_create_local_db(self, sample_rows, test_db_path):
         """Test database creation with sample records"""
         create_local_db(sample_rows, test_db_path)
@@ -104,19 +119,99 @@ class TestDataIngest:
         expected_columns = ['id', 'address', 'lat', 'lon', 'posted_twitter', 'posted_bluesky']
         assert all(col in columns for col in expected_columns)
         
-        # Check record count
+        # Duplicate pin10 rows upsert in place, so only unique pins remain
         cursor.execute("SELECT COUNT(*) FROM lots")
         count = cursor.fetchone()[0]
-        assert count == len(sample_rows)
-        
+        assert count == 2
+
         # Check first record
         cursor.execute("SELECT * FROM lots WHERE id=?", (sample_rows[0]['pin10'],))
         record = cursor.fetchone()
         expected_address = "123 MAIN ST, CHICAGO, IL 60601"
         assert record[1] == expected_address  # address field
-        
+
+        # The upsert keeps the address from the last row seen for a pin10
+        cursor.execute("SELECT address FROM lots WHERE id=?", ('1407115017',))
+        assert cursor.fetchone()[0] == "127 MAIN ST, CHICAGO, IL 60601"
+
+        # The partial claim indexes must exist so the bot's next-unposted
+        # query is an index seek, not a table scan
+        cursor.execute("PRAGMA index_list(lots)")
+        index_names = [row[1] for row in cursor.fetchall()]
+        assert 'idx_lots_unposted_bluesky' in index_names
+        assert 'idx_lots_unposted_twitter' in index_names
+
+        # The bulk-load PRAGMAs must be restored to WAL afterwards so the
+        # bot's incremental updates don't fsync a rollback journal per post
+        cursor.execute("PRAGMA journal_mode")
+        assert cursor.fetchone()[0] == 'wal'
+
+        conn.close()
+
+    def test_create_local_db_batched_inserts(self, sample_rows, test_db_path, monkeypatch):
+        """Test that inserts go through chunked multi-row statements"""
+        counts = {'executemany': 0, 'insert_execute': 0}
+        real_connect = sqlite3.connect
+
+        class CountingCursor:
+            def __init__(self, cursor):
+                self._cursor = cursor
+
+            def execute(self, sql, *args):
+                if sql.lstrip().upper().startswith('INSERT'):
+                    counts['insert_execute'] += 1
+                return self._cursor.execute(sql, *args)
+
+            def executemany(self, sql, *args):
+                counts['executemany'] += 1
+                return self._cursor.executemany(sql, *args)
+
+            def __getattr__(self, name):
+                return getattr(self._cursor, name)
+
+        class CountingConnection:
+            def __init__(self, conn):
+                self._conn = conn
+
+            def cursor(self):
+                return CountingCursor(self._conn.cursor())
+
+            def __getattr__(self, name):
+                return getattr(self._conn, name)
+
+        monkeypatch.setattr(
+            data_ingest.sqlite3, 'connect',
+            lambda *args, **kwargs: CountingConnection(real_connect(*args, **kwargs)))
+
+        # 250 unique pins -> two full 100-row statements plus one remainder
+        rows = [dict(sample_rows[0], pin10=str(i).zfill(10)) for i in range(250)]
+        create_local_db(rows, test_db_path)
+
+        assert counts['insert_execute'] == 3
+        assert counts['executemany'] == 0
+
+        conn = sqlite3.connect(test_db_path)
+        count = conn.execute("SELECT COUNT(*) FROM lots").fetchone()[0]
+        conn.close()
+        assert count == 250
+
+    def test_create_local_db_preserves_posted_state(self, sample_rows, test_db_path):
+        """Test that re-running the ingest keeps posted markers"""
+        create_local_db(sample_rows, test_db_path)
+
+        conn = sqlite3.connect(test_db_path)
+        conn.execute("UPDATE lots SET posted_bluesky='bsky123' WHERE id='1407115016'")
+        conn.commit()
         conn.close()
 
+        create_local_db(sample_rows, test_db_path)
+
+        conn = sqlite3.connect(test_db_path)
+        value = conn.execute(
+            "SELECT posted_bluesky FROM lots WHERE id='1407115016'").fetchone()[0]
+        conn.close()
+        assert value == 'bsky123'
+
     def test_fetch_cook_county_rows_no_token(self, monkeypatch):
         """Test error handling when token is missing"""
         monkeypatch.delenv("CHICAGO_DATA_PORTAL_TOKEN", raising=False)
@@ -124,17 +219,12 @@ class TestDataIngest:
         with pytest.raises(ValueError, match="CHICAGO_DATA_PORTAL_TOKEN not found"):
             fetch_cook_county_rows()
 
-    @responses.activate
-    def test_fetch_cook_county_rows_api_error(self, monkeypatch):
+    def test_fetch_cook_county_rows_api_error(self, monkeypatch, fake_transport):
         """Test handling of API errors"""
         monkeypatch.setenv("CHICAGO_DATA_PORTAL_TOKEN", "test_token")
-        
-        responses.add(
-            responses.GET,
-            "https://datacatalog.cookcountyil.gov/resource/3723-97qp.csv",
-            status=500
-        )
-        
+
+        fake_transport[data_ingest._SODA_URL] = _make_response(status=500)
+
         with pytest.raises(requests.exceptions.HTTPError):
             fetch_cook_county_rows()
 
@@ -4,30 +4,37 @@ import os
 from io import BytesIO
 from everylot.twitter import TwitterPoster
 
-@pytest.fixture
+@pytest.fixture(scope="class")
 def mock_tweepy_api():
-    """Create a mock tweepy API"""
+    """Patch tweepy once per class; patch start/stop dominates these
+    mock-only tests, and per-test state is handled by reset_mocks"""
     with patch('everylot.twitter.tweepy') as mock_tweepy:
-        # Mock the auth handler
-        mock_auth = Mock()
-        mock_tweepy.OAuth1UserHandler.return_value = mock_auth
-        
-        # Mock the API
-        mock_api = Mock()
-        mock_tweepy.API.return_value = mock_api
-        
-        # Mock successful media upload
-        mock_media = Mock()
-        mock_media.media_id_string = "fake_media_id"
-        mock_api.media_upload.return_value = mock_media
-        
-        # Mock successful status update
-        mock_status = Mock()
-        mock_status.id = 12345
-        mock_api.update_status.return_value = mock_status
-        
         yield mock_tweepy
 
+@pytest.fixture(autouse=True)
+def reset_mocks(mock_tweepy_api):
+    """Clear call state and side effects, then reinstall the default
+    happy-path behavior before every test"""
+    mock_tweepy_api.reset_mock(return_value=True, side_effect=True)
+
+    # Mock the auth handler
+    mock_auth = Mock()
+    mock_tweepy_api.OAuth1UserHandler.return_value = mock_auth
+
+    # Mock the API
+    mock_api = Mock()
+    mock_tweepy_api.API.return_value = mock_api
+
+    # Mock successful media upload
+    mock_media = Mock()
+    mock_media.media_id_string = "fake_media_id"
+    mock_api.media_upload.return_value = mock_media
+
+    # Mock successful status update
+    mock_status = Mock()
+    mock_status.id = 12345
+    mock_api.update_status.return_value = mock_status
+
 @pytest.fixture
 def mock_env(monkeypatch):
     """Set up mock environment variables"""